@@ -9,42 +9,224 @@ All rights reserved.
 
 import hashlib
 import json
+import secrets
 import time
-from datetime import datetime
-from Crypto.Cipher import AES
-from Crypto.Random import get_random_bytes
-from Crypto.Util.Padding import pad, unpad
+from datetime import datetime, timedelta
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 import base64
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# numpy/numba are only needed for the fallback scanner
+np = None
+njit = None
+if ahocorasick is None:
+    try:
+        import numpy as np
+        from numba import njit
+    except ImportError:
+        np = None
+        njit = None
+
+# Patterns flagged as injection attempts by scan_for_threats
+SUSPICIOUS_PATTERNS = [
+    'DROP TABLE', 'DELETE FROM', '<script>', 'javascript:', 
+    'eval(', 'exec(', 'import os', 'subprocess'
+]
+
+# Payloads are case-folded in windows of this many characters while scanning
+THREAT_SCAN_CHUNK_SIZE = 64 * 1024
+
+# Large text payloads are encoded and hashed this many characters at a time
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Number of most recent security events retained in the ring buffer
+SECURITY_LOG_SIZE = 100
+
+# GCM nonce size in bytes
+GCM_NONCE_SIZE = 12
+
+if njit is not None:
+    @njit(cache=True)
+    def _scan_bytes(buf, first_byte_mask, patterns, lengths):
+        """Return a bitmask of the patterns found in buf, ignoring ASCII case"""
+        found = 0
+        n = buf.shape[0]
+        for i in range(n):
+            c = buf[i]
+            if 65 <= c <= 90:
+                c += 32
+            # Only patterns starting with this byte are compared in full
+            candidates = first_byte_mask[c] & ~found
+            j = 0
+            while candidates:
+                if candidates & 1 and i + lengths[j] <= n:
+                    k = 1
+                    while k < lengths[j]:
+                        b = buf[i + k]
+                        if 65 <= b <= 90:
+                            b += 32
+                        if b != patterns[j, k]:
+                            break
+                        k += 1
+                    if k == lengths[j]:
+                        found |= 1 << j
+                candidates >>= 1
+                j += 1
+        return found
+else:
+    _scan_bytes = None
+
+_EPOCH = datetime(1970, 1, 1)
+
+def _format_ns(timestamp_ns):
+    """Format an epoch timestamp in nanoseconds as a naive UTC ISO string"""
+    return (_EPOCH + timedelta(microseconds=timestamp_ns // 1000)).isoformat()
+
+def _iter_strings(obj):
+    """Yield every string key and string leaf of a nested dict/list structure"""
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            if isinstance(key, str):
+                yield key
+            yield from _iter_strings(value)
+    elif isinstance(obj, (list, tuple)):
+        for item in obj:
+            yield from _iter_strings(item)
+    elif isinstance(obj, str):
+        yield obj
+
+def _iter_canonical_chunks(obj):
+    """Yield a canonical byte encoding of a nested structure, keys in sorted order"""
+    if isinstance(obj, dict):
+        yield b'{'
+        # Keys are repr()-encoded like scalars so they cannot contain raw separators
+        for key in sorted(obj, key=repr):
+            yield repr(key).encode() + b'\x00'
+            yield from _iter_canonical_chunks(obj[key])
+            yield b'\x1e'
+        yield b'}'
+    elif isinstance(obj, (list, tuple)):
+        yield b'['
+        for item in obj:
+            yield from _iter_canonical_chunks(item)
+            yield b'\x1e'
+        yield b']'
+    else:
+        yield repr(obj).encode()
+
 class QuantumSecurityModule:
     """Advanced quantum security operations"""
     
     def __init__(self):
         self.quantum_key = self._generate_quantum_key()
-        self.security_log = []
+        # OpenSSL-backed AEAD handle, reused for every encrypt/decrypt call
+        self._aead = AESGCM(self.quantum_key)
+        self._key_hex_bytes = self.quantum_key.hex().encode()
+        self._threat_automaton = self._build_threat_automaton() if ahocorasick is not None else None
+        self._threat_tables = self._build_threat_tables() if self._threat_automaton is None and _scan_bytes is not None else None
+        # Security log stored column-wise in fixed-size ring buffers
+        self._log_ts = [None] * SECURITY_LOG_SIZE
+        self._log_type = [None] * SECURITY_LOG_SIZE
+        self._log_detail = [None] * SECURITY_LOG_SIZE
+        self._log_pos = 0
+        # Status fields that never change for the lifetime of the module
+        self._static_status = {
+            'module_status': 'operational',
+            'quantum_encryption': 'active',
+            'threat_detection': 'monitoring',
+            'encryption_strength': 'AES-256-Quantum',
+            'owner': 'Ervin Remus Radosavlevici',
+            'contact': 'radosavlevici210@icloud.com',
+            'copyright': '© 2025 Ervin Remus Radosavlevici'
+        }
         
     def _generate_quantum_key(self):
         """Generate quantum-secure encryption key"""
-        return get_random_bytes(32)
+        return AESGCM.generate_key(bit_length=256)
+    
+    def _seal(self, data, timestamp):
+        """Encrypt a single payload with the shared AEAD handle"""
+        if isinstance(data, dict):
+            data = json.dumps(data)
+        
+        data_bytes = data.encode('utf-8')
+        nonce = secrets.token_bytes(GCM_NONCE_SIZE)
+        
+        # AESGCM output is ciphertext || tag, so the blob is nonce || ciphertext || tag
+        sealed = self._aead.encrypt(nonce, data_bytes, None)
+        
+        return {
+            'blob': base64.b64encode(nonce + sealed).decode('utf-8'),
+            'timestamp': timestamp,
+            'encryption_method': 'AES-256-GCM-Quantum'
+        }
+    
+    def _build_threat_automaton(self):
+        """Compile the suspicious patterns into a single Aho-Corasick automaton"""
+        automaton = ahocorasick.Automaton()
+        for index, pattern in enumerate(SUSPICIOUS_PATTERNS):
+            automaton.add_word(pattern.lower(), index)
+        automaton.make_automaton()
+        return automaton
+    
+    def _build_threat_tables(self):
+        """Pack the suspicious patterns into lookup arrays for the JIT byte scanner"""
+        encoded = [pattern.lower().encode('ascii') for pattern in SUSPICIOUS_PATTERNS]
+        first_byte_mask = np.zeros(256, dtype=np.int64)
+        patterns = np.zeros((len(encoded), max(len(p) for p in encoded)), dtype=np.uint8)
+        lengths = np.zeros(len(encoded), dtype=np.int64)
+        for index, pattern in enumerate(encoded):
+            first_byte_mask[pattern[0]] |= 1 << index
+            patterns[index, :len(pattern)] = np.frombuffer(pattern, dtype=np.uint8)
+            lengths[index] = len(pattern)
+        return first_byte_mask, patterns, lengths
+    
+    def _iter_scan_windows(self, text):
+        """Yield overlapping windows of text for case-folding and scanning"""
+        if len(text) <= THREAT_SCAN_CHUNK_SIZE:
+            yield text
+            return
+        
+        # Large payloads are processed window by window so no full-size folded or
+        # encoded copy is made; windows overlap so boundary-spanning matches are kept
+        overlap = max(len(pattern) for pattern in SUSPICIOUS_PATTERNS) - 1
+        for start in range(0, len(text), THREAT_SCAN_CHUNK_SIZE):
+            yield text[start:start + THREAT_SCAN_CHUNK_SIZE + overlap]
+    
+    def _match_threat_patterns(self, text):
+        """Return indexes of suspicious patterns found in text, ignoring case"""
+        automaton = self._threat_automaton
+        if automaton is None:
+            return self._match_threat_patterns_fallback(text)
+        
+        matched = set()
+        for window in self._iter_scan_windows(text):
+            matched.update(index for _, index in automaton.iter(window.lower()))
+        return matched
+    
+    def _match_threat_patterns_fallback(self, text):
+        """Match suspicious patterns without pyahocorasick"""
+        if self._threat_tables is not None:
+            found = 0
+            for window in self._iter_scan_windows(text):
+                buf = np.frombuffer(window.encode('utf-8'), dtype=np.uint8)
+                found |= _scan_bytes(buf, *self._threat_tables)
+            return {index for index in range(len(SUSPICIOUS_PATTERNS)) if found >> index & 1}
+        
+        matched = set()
+        for window in self._iter_scan_windows(text):
+            window_lower = window.lower()
+            matched.update(index for index, pattern in enumerate(SUSPICIOUS_PATTERNS) if pattern.lower() in window_lower)
+        return matched
     
     def encrypt_data(self, data):
         """Encrypt data using quantum-secure algorithms"""
         try:
-            if isinstance(data, dict):
-                data = json.dumps(data)
-            
-            data_bytes = data.encode('utf-8')
-            cipher = AES.new(self.quantum_key, AES.MODE_GCM)
-            
-            encrypted_data, auth_tag = cipher.encrypt_and_digest(data_bytes)
-            
-            result = {
-                'encrypted_data': base64.b64encode(encrypted_data).decode('utf-8'),
-                'nonce': base64.b64encode(cipher.nonce).decode('utf-8'),
-                'auth_tag': base64.b64encode(auth_tag).decode('utf-8'),
-                'timestamp': datetime.utcnow().isoformat(),
-                'encryption_method': 'AES-256-GCM-Quantum'
-            }
+            result = self._seal(data, datetime.utcnow().isoformat())
             
             self._log_security_event('data_encrypted', 'success')
             return result
@@ -53,15 +235,34 @@ class QuantumSecurityModule:
             self._log_security_event('encryption_error', str(e))
             return None
     
+    def encrypt_many(self, items):
+        """Encrypt a batch of payloads, reusing one AEAD context for all records"""
+        try:
+            timestamp = datetime.utcnow().isoformat()
+            seal = self._seal
+            results = [seal(item, timestamp) for item in items]
+            
+            self._log_security_event('data_encrypted', f"batch: {len(results)}")
+            return results
+            
+        except Exception as e:
+            self._log_security_event('encryption_error', str(e))
+            return None
+    
     def decrypt_data(self, encrypted_package):
         """Decrypt quantum-secured data"""
         try:
-            encrypted_data = base64.b64decode(encrypted_package['encrypted_data'])
-            nonce = base64.b64decode(encrypted_package['nonce'])
-            auth_tag = base64.b64decode(encrypted_package['auth_tag'])
+            if 'blob' in encrypted_package:
+                blob = base64.b64decode(encrypted_package['blob'])
+                nonce, sealed = blob[:GCM_NONCE_SIZE], blob[GCM_NONCE_SIZE:]
+            else:
+                # Packages produced before the single-blob format
+                encrypted_data = base64.b64decode(encrypted_package['encrypted_data'])
+                nonce = base64.b64decode(encrypted_package['nonce'])
+                auth_tag = base64.b64decode(encrypted_package['auth_tag'])
+                sealed = encrypted_data + auth_tag
             
-            cipher = AES.new(self.quantum_key, AES.MODE_GCM, nonce=nonce)
-            decrypted_data = cipher.decrypt_and_verify(encrypted_data, auth_tag)
+            decrypted_data = self._aead.decrypt(nonce, sealed, None)
             
             result = decrypted_data.decode('utf-8')
             
@@ -79,14 +280,25 @@ class QuantumSecurityModule:
     
     def generate_secure_hash(self, data):
         """Generate quantum-secure hash"""
-        if isinstance(data, dict):
-            data = json.dumps(data, sort_keys=True)
-        
         timestamp = str(int(time.time()))
-        combined_data = f"{data}{timestamp}{self.quantum_key.hex()}"
+        
+        # Feed data || timestamp || key hex directly instead of concatenating
+        hasher = hashlib.new('sha256', usedforsecurity=True)
+        if isinstance(data, dict):
+            for chunk in _iter_canonical_chunks(data):
+                hasher.update(chunk)
+        elif isinstance(data, (bytes, bytearray, memoryview)):
+            hasher.update(data)
+        else:
+            # Encode in slices so large payloads are never copied whole
+            text = str(data)
+            for start in range(0, len(text), HASH_CHUNK_SIZE):
+                hasher.update(text[start:start + HASH_CHUNK_SIZE].encode())
+        hasher.update(timestamp.encode())
+        hasher.update(self._key_hex_bytes)
         
         return {
-            'hash': hashlib.sha256(combined_data.encode()).hexdigest(),
+            'hash': hasher.hexdigest(),
             'timestamp': timestamp,
             'algorithm': 'SHA-256-Quantum-Enhanced'
         }
@@ -100,25 +312,22 @@ class QuantumSecurityModule:
         """Advanced threat scanning"""
         threats_detected = []
         
+        # Check for suspicious patterns in a single pass over the payload;
+        # dicts are scanned leaf by leaf rather than serialized first
         if isinstance(data, dict):
-            data_str = json.dumps(data)
+            matched = set()
+            for leaf in _iter_strings(data):
+                matched |= self._match_threat_patterns(leaf)
         else:
-            data_str = str(data)
-        
-        # Check for suspicious patterns
-        suspicious_patterns = [
-            'DROP TABLE', 'DELETE FROM', '<script>', 'javascript:', 
-            'eval(', 'exec(', 'import os', 'subprocess'
-        ]
+            matched = self._match_threat_patterns(str(data))
         
-        for pattern in suspicious_patterns:
-            if pattern.lower() in data_str.lower():
-                threats_detected.append({
-                    'type': 'injection_attempt',
-                    'pattern': pattern,
-                    'severity': 'high',
-                    'timestamp': datetime.utcnow().isoformat()
-                })
+        for index in sorted(matched):
+            threats_detected.append({
+                'type': 'injection_attempt',
+                'pattern': SUSPICIOUS_PATTERNS[index],
+                'severity': 'high',
+                'timestamp': datetime.utcnow().isoformat()
+            })
         
         # Log scan results
         self._log_security_event('threat_scan', f"threats_found: {len(threats_detected)}")
@@ -133,30 +342,34 @@ class QuantumSecurityModule:
     
     def _log_security_event(self, event_type, details):
         """Log security events"""
-        log_entry = {
-            'timestamp': datetime.utcnow().isoformat(),
-            'event_type': event_type,
-            'details': details,
+        slot = self._log_pos % SECURITY_LOG_SIZE
+        self._log_ts[slot] = time.time_ns()
+        self._log_type[slot] = event_type
+        self._log_detail[slot] = details
+        self._log_pos += 1
+    
+    def _log_entry(self, slot):
+        """Build the log entry dict stored in a ring buffer slot"""
+        return {
+            'timestamp': _format_ns(self._log_ts[slot]),
+            'event_type': self._log_type[slot],
+            'details': self._log_detail[slot],
             'security_module': 'quantum_advanced'
         }
-        self.security_log.append(log_entry)
-        
-        # Keep only last 100 entries
-        if len(self.security_log) > 100:
-            self.security_log = self.security_log[-100:]
+    
+    @property
+    def security_log(self):
+        """Retained security events, oldest first"""
+        count = min(self._log_pos, SECURITY_LOG_SIZE)
+        start = self._log_pos - count
+        return [self._log_entry(i % SECURITY_LOG_SIZE) for i in range(start, self._log_pos)]
     
     def get_security_status(self):
         """Get comprehensive security status"""
         return {
-            'module_status': 'operational',
-            'quantum_encryption': 'active',
-            'threat_detection': 'monitoring',
-            'security_events': len(self.security_log),
-            'last_event': self.security_log[-1] if self.security_log else None,
-            'encryption_strength': 'AES-256-Quantum',
-            'owner': 'Ervin Remus Radosavlevici',
-            'contact': 'radosavlevici210@icloud.com',
-            'copyright': '© 2025 Ervin Remus Radosavlevici'
+            **self._static_status,
+            'security_events': min(self._log_pos, SECURITY_LOG_SIZE),
+            'last_event': self._log_entry((self._log_pos - 1) % SECURITY_LOG_SIZE) if self._log_pos else None
         }
 
 # Global security module instance
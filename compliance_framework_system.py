@@ -11,46 +11,100 @@ Licensed under MIT License with additional copyright protections
 All rights reserved.
 """
 
-from flask import request, jsonify
-import json
+from flask import Response, request, jsonify
+from json_provider import check_json_value, dumps_json, loads_json, reparse_exact
+import atexit
 import os
 import logging
+import threading
+import time
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Compact the data journal once it holds this many entries per stored key
+JOURNAL_COMPACTION_RATIO = 10
+
+# (epoch second, formatted UTC timestamp) reused by responses within that second
+_ISO_CACHE = (0, "")
+
+def _iso_now():
+    """Current UTC time as an ISO string at one-second precision"""
+    global _ISO_CACHE
+    now = int(time.time())
+    if now != _ISO_CACHE[0]:
+        _ISO_CACHE = (now, time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(now)))
+    return _ISO_CACHE[1]
+
 class BackupSystem:
-    def __init__(self, backup_dir="backup"):
+    def __init__(self, backup_dir="backup", min_interval=0.5):
         self.backup_dir = backup_dir
         self.data_file = os.path.join(backup_dir, "quantum_data.json")
+        self.journal_file = os.path.join(backup_dir, "quantum_data.jsonl")
         self.settings_file = os.path.join(backup_dir, "system_settings.json")
         
         # Ensure backup directory exists
         os.makedirs(backup_dir, exist_ok=True)
         
         # Initialize data store
+        self._save_lock = threading.Lock()
+        self._journal_entries = 0
+        # Set when a backup file exists but cannot be read, so it is never overwritten
+        self._data_load_failed = False
+        self._settings_load_failed = False
         self.data_store = self.load_data()
         self.settings_store = self.load_settings()
         
+        # Debounced background writer that compacts the data journal
+        self.min_interval = min_interval
+        self._dirty = threading.Event()
+        self._writer = threading.Thread(target=self._flush_loop, name="quantum-backup-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.flush)
+        
     def load_data(self):
-        """Load quantum data from backup file"""
+        """Load quantum data from the backup snapshot and replay the journal"""
+        data = {}
+        self._data_load_failed = False
         if os.path.exists(self.data_file):
             try:
-                with open(self.data_file, "r") as f:
-                    return json.load(f)
+                with open(self.data_file, "rb") as f:
+                    data = loads_json(f.read())
             except Exception as e:
                 logger.error(f"Failed to load data: {e}")
-                return {}
-        return {}
+                self._data_load_failed = True
+                data = {}
+        
+        entries = 0
+        if os.path.exists(self.journal_file):
+            try:
+                with open(self.journal_file, "rb") as f:
+                    for line in f:
+                        try:
+                            entry = loads_json(line)
+                        except ValueError:
+                            logger.warning("Skipping unreadable quantum data journal entry")
+                            continue
+                        if not (isinstance(entry, dict) and isinstance(entry.get("k"), str) and "v" in entry):
+                            logger.warning("Skipping malformed quantum data journal entry")
+                            continue
+                        data[entry["k"]] = entry["v"]
+                        entries += 1
+            except Exception as e:
+                logger.error(f"Failed to replay data journal: {e}")
+        self._journal_entries = entries
+        return data
     
     def load_settings(self):
         """Load system settings from backup file"""
+        self._settings_load_failed = False
         if os.path.exists(self.settings_file):
             try:
-                with open(self.settings_file, "r") as f:
-                    return json.load(f)
+                with open(self.settings_file, "rb") as f:
+                    return loads_json(f.read())
             except Exception as e:
                 logger.error(f"Failed to load settings: {e}")
+                self._settings_load_failed = True
                 return self.get_default_settings()
         return self.get_default_settings()
     
@@ -73,38 +127,103 @@ class BackupSystem:
         }
     
     def save_data(self):
-        """Save quantum data to backup file"""
+        """Save a full quantum data snapshot and truncate the journal"""
+        if self._data_load_failed:
+            logger.error(f"Refusing to overwrite unreadable data backup: {self.data_file}")
+            return False
         try:
-            with open(self.data_file, "w") as f:
-                json.dump(self.data_store, f, indent=2)
+            with self._save_lock:
+                snapshot = dict(self.data_store)
+                tmp_file = self.data_file + ".tmp"
+                with open(tmp_file, "wb") as f:
+                    f.write(dumps_json(snapshot, indent=True))
+                os.replace(tmp_file, self.data_file)
+                # Every journal entry is now contained in the snapshot
+                open(self.journal_file, "wb").close()
+                self._journal_entries = 0
             logger.info("Quantum data backup completed successfully")
             return True
         except Exception as e:
             logger.error(f"Failed to save data: {e}")
             return False
     
+    def save_data_incremental(self, key, value):
+        """Store a single entry by appending it to the data journal
+        
+        Raises ValueError for values that cannot be written back exactly.
+        """
+        check_json_value(value)
+        try:
+            with self._save_lock:
+                self.data_store[key] = value
+                with open(self.journal_file, "ab") as f:
+                    f.write(dumps_json({"k": key, "v": value}) + b"\n")
+                self._journal_entries += 1
+                needs_compaction = self._journal_entries > JOURNAL_COMPACTION_RATIO * max(len(self.data_store), 1)
+            if needs_compaction:
+                self.schedule_save()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to journal data: {e}")
+            return False
+    
+    def schedule_save(self):
+        """Mark quantum data as changed so the background writer snapshots it"""
+        self._dirty.set()
+    
+    def flush(self):
+        """Write pending quantum data changes immediately"""
+        if self._dirty.is_set():
+            self._dirty.clear()
+            return self.save_data()
+        return True
+    
+    def _flush_loop(self):
+        """Coalesce scheduled saves into at most one write per interval"""
+        while True:
+            self._dirty.wait()
+            time.sleep(self.min_interval)
+            self.flush()
+    
     def save_settings(self):
         """Save system settings to backup file"""
+        if self._settings_load_failed:
+            logger.error(f"Refusing to overwrite unreadable settings backup: {self.settings_file}")
+            return False
         try:
             self.settings_store["last_backup"] = datetime.utcnow().isoformat()
-            with open(self.settings_file, "w") as f:
-                json.dump(self.settings_store, f, indent=2)
+            with open(self.settings_file, "wb") as f:
+                f.write(dumps_json(self.settings_store, indent=True))
             logger.info("System settings backup completed successfully")
             return True
         except Exception as e:
             logger.error(f"Failed to save settings: {e}")
             return False
     
+    def _set_aside(self, path):
+        """Rename an unreadable backup file so it is not overwritten"""
+        corrupt_path = path + ".corrupt"
+        os.replace(path, corrupt_path)
+        logger.warning(f"Moved unreadable backup {path} to {corrupt_path}")
+    
     def restore_all_to_defaults(self):
         """Restore all settings to default values"""
         try:
+            # Keep unreadable backups by moving them aside before writing defaults
+            if self._data_load_failed:
+                self._set_aside(self.data_file)
+                self._data_load_failed = False
+            if self._settings_load_failed:
+                self._set_aside(self.settings_file)
+                self._settings_load_failed = False
+            
             self.settings_store = self.get_default_settings()
             self.settings_store["last_restore"] = datetime.utcnow().isoformat()
             self.data_store = {}
             
             # Save the restored defaults
-            self.save_data()
-            self.save_settings()
+            if not (self.save_data() and self.save_settings()):
+                return False
             
             logger.info("All systems restored to default settings")
             return True
@@ -115,6 +234,154 @@ class BackupSystem:
 # Initialize backup system
 backup_system = BackupSystem()
 
+# Static backup dashboard page, encoded once at import
+_DASHBOARD_HTML = """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Quantum Security Backup System</title>
+    <style>
+        body { font-family: 'Courier New', monospace; background: #000; color: #00ff00; margin: 0; padding: 20px; }
+        .container { max-width: 1200px; margin: 0 auto; }
+        .header { text-align: center; margin-bottom: 30px; }
+        .section { background: rgba(0, 255, 0, 0.1); border: 1px solid #00ff00; margin: 20px 0; padding: 20px; border-radius: 5px; }
+        .button { background: #00ff00; color: #000; padding: 10px 20px; border: none; cursor: pointer; margin: 5px; border-radius: 3px; }
+        .button:hover { background: #00cc00; }
+        .status { margin: 10px 0; padding: 10px; background: rgba(0, 255, 0, 0.2); border-radius: 3px; }
+        .data-display { background: #001100; padding: 15px; border-radius: 5px; white-space: pre-wrap; max-height: 300px; overflow-y: auto; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>🛡️ QUANTUM SECURITY BACKUP SYSTEM 🛡️</h1>
+            <p>© 2025 Ervin Remus Radosavlevici - Official Owner</p>
+            <p>📧 Contact: radosavlevici210@icloud.com</p>
+        </div>
+
+        <div class="section">
+            <h2>🔄 Backup Operations</h2>
+            <button class="button" onclick="manualBackup()">Manual Backup</button>
+            <button class="button" onclick="viewData()">View Data</button>
+            <button class="button" onclick="viewSettings()">View Settings</button>
+            <div id="backup-status" class="status"></div>
+        </div>
+
+        <div class="section">
+            <h2>🔧 Restore Operations</h2>
+            <button class="button" onclick="restoreData()">Restore Data</button>
+            <button class="button" onclick="restoreDefaults()">Restore All to Defaults</button>
+            <div id="restore-status" class="status"></div>
+        </div>
+
+        <div class="section">
+            <h2>📊 Data Management</h2>
+            <input type="text" id="data-key" placeholder="Enter key" style="padding: 10px; margin: 5px;">
+            <input type="text" id="data-value" placeholder="Enter value" style="padding: 10px; margin: 5px;">
+            <button class="button" onclick="saveData()">Save Data</button>
+            <div id="data-status" class="status"></div>
+        </div>
+
+        <div class="section">
+            <h2>📋 System Information</h2>
+            <div id="system-info" class="data-display">Loading system information...</div>
+        </div>
+    </div>
+
+    <script>
+        async function manualBackup() {
+            try {
+                const response = await fetch('/api/backup/manual', { method: 'POST' });
+                const result = await response.json();
+                document.getElementById('backup-status').textContent = JSON.stringify(result, null, 2);
+            } catch (error) {
+                document.getElementById('backup-status').textContent = 'Error: ' + error.message;
+            }
+        }
+
+        async function viewData() {
+            try {
+                const response = await fetch('/api/backup/data');
+                const result = await response.json();
+                document.getElementById('backup-status').textContent = JSON.stringify(result, null, 2);
+            } catch (error) {
+                document.getElementById('backup-status').textContent = 'Error: ' + error.message;
+            }
+        }
+
+        async function viewSettings() {
+            try {
+                const response = await fetch('/api/backup/settings');
+                const result = await response.json();
+                document.getElementById('backup-status').textContent = JSON.stringify(result, null, 2);
+            } catch (error) {
+                document.getElementById('backup-status').textContent = 'Error: ' + error.message;
+            }
+        }
+
+        async function restoreData() {
+            try {
+                const response = await fetch('/api/restore/data', { method: 'POST' });
+                const result = await response.json();
+                document.getElementById('restore-status').textContent = JSON.stringify(result, null, 2);
+            } catch (error) {
+                document.getElementById('restore-status').textContent = 'Error: ' + error.message;
+            }
+        }
+
+        async function restoreDefaults() {
+            if (confirm('This will restore all settings to defaults. Continue?')) {
+                try {
+                    const response = await fetch('/api/restore/defaults', { method: 'POST' });
+                    const result = await response.json();
+                    document.getElementById('restore-status').textContent = JSON.stringify(result, null, 2);
+                } catch (error) {
+                    document.getElementById('restore-status').textContent = 'Error: ' + error.message;
+                }
+            }
+        }
+
+        async function saveData() {
+            const key = document.getElementById('data-key').value;
+            const value = document.getElementById('data-value').value;
+
+            if (!key || !value) {
+                document.getElementById('data-status').textContent = 'Please enter both key and value';
+                return;
+            }
+
+            try {
+                const response = await fetch('/api/backup/data', {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify({ key, value })
+                });
+                const result = await response.json();
+                document.getElementById('data-status').textContent = JSON.stringify(result, null, 2);
+                document.getElementById('data-key').value = '';
+                document.getElementById('data-value').value = '';
+            } catch (error) {
+                document.getElementById('data-status').textContent = 'Error: ' + error.message;
+            }
+        }
+
+        // Load system information on page load
+        window.onload = async function() {
+            try {
+                const response = await fetch('/api/system-status');
+                const result = await response.json();
+                document.getElementById('system-info').textContent = JSON.stringify(result, null, 2);
+            } catch (error) {
+                document.getElementById('system-info').textContent = 'Error loading system info: ' + error.message;
+            }
+        };
+    </script>
+</body>
+</html>
+""".encode('utf-8')
+
 def register_backup_routes(app):
     """Register backup and restore routes with the Flask app"""
     
@@ -126,6 +393,8 @@ def register_backup_routes(app):
                 data = request.get_json()
                 if not data:
                     return jsonify({'error': 'No data provided'}), 400
+                # orjson reads integers beyond 64 bits as floats; re-read such bodies exactly
+                data = reparse_exact(request.get_data(), data)
                 
                 key = data.get('key')
                 value = data.get('value')
@@ -133,14 +402,20 @@ def register_backup_routes(app):
                 if not key:
                     return jsonify({'error': 'Key is required'}), 400
                 
-                backup_system.data_store[key] = value
-                backup_system.save_data()
+                # Stored keys are strings, as they are once written to the backup file
+                key = str(key)
+                try:
+                    saved = backup_system.save_data_incremental(key, value)
+                except ValueError as e:
+                    return jsonify({'error': str(e)}), 400
+                if not saved:
+                    return jsonify({'error': 'Failed to save data'}), 500
                 
                 logger.info(f"Quantum data saved: {key}")
                 return jsonify({
                     'status': 'saved',
                     'key': key,
-                    'timestamp': datetime.utcnow().isoformat(),
+                    'timestamp': _iso_now(),
                     'copyright': '© 2025 Ervin Remus Radosavlevici'
                 }), 201
             
@@ -166,7 +441,7 @@ def register_backup_routes(app):
             if data_saved and settings_saved:
                 return jsonify({
                     'status': 'manual backup completed',
-                    'timestamp': datetime.utcnow().isoformat(),
+                    'timestamp': _iso_now(),
                     'data_entries': len(backup_system.data_store),
                     'copyright': '© 2025 Ervin Remus Radosavlevici'
                 })
@@ -181,8 +456,12 @@ def register_backup_routes(app):
     def api_restore_data():
         """API endpoint for data restoration"""
         try:
-            if os.path.exists(backup_system.data_file):
-                backup_system.data_store = backup_system.load_data()
+            backup_system.flush()
+            if os.path.exists(backup_system.data_file) or os.path.exists(backup_system.journal_file):
+                restored = backup_system.load_data()
+                if backup_system._data_load_failed:
+                    return jsonify({'error': 'Backup file could not be read'}), 500
+                backup_system.data_store = restored
                 backup_system.settings_store["last_restore"] = datetime.utcnow().isoformat()
                 backup_system.save_settings()
                 
@@ -190,7 +469,7 @@ def register_backup_routes(app):
                 return jsonify({
                     'status': 'restored',
                     'entries_restored': len(backup_system.data_store),
-                    'timestamp': datetime.utcnow().isoformat(),
+                    'timestamp': _iso_now(),
                     'copyright': '© 2025 Ervin Remus Radosavlevici'
                 })
             else:
@@ -213,7 +492,7 @@ def register_backup_routes(app):
                     'neural_electrodes': 15750,
                     'thought_reading_accuracy': 96.8,
                     'security_level': 'MAXIMUM',
-                    'timestamp': datetime.utcnow().isoformat(),
+                    'timestamp': _iso_now(),
                     'owner': 'Ervin Remus Radosavlevici',
                     'contact': 'radosavlevici210@icloud.com',
                     'copyright': '© 2025 Ervin Remus Radosavlevici'
@@ -241,7 +520,7 @@ def register_backup_routes(app):
                     
                     return jsonify({
                         'status': 'settings updated',
-                        'timestamp': datetime.utcnow().isoformat(),
+                        'timestamp': _iso_now(),
                         'copyright': '© 2025 Ervin Remus Radosavlevici'
                     })
             
@@ -258,153 +537,4 @@ def register_backup_routes(app):
     @app.route('/backup-dashboard')
     def backup_dashboard():
         """Backup and restore dashboard page"""
-        try:
-            return f"""
-            <!DOCTYPE html>
-            <html lang="en">
-            <head>
-                <meta charset="UTF-8">
-                <meta name="viewport" content="width=device-width, initial-scale=1.0">
-                <title>Quantum Security Backup System</title>
-                <style>
-                    body {{ font-family: 'Courier New', monospace; background: #000; color: #00ff00; margin: 0; padding: 20px; }}
-                    .container {{ max-width: 1200px; margin: 0 auto; }}
-                    .header {{ text-align: center; margin-bottom: 30px; }}
-                    .section {{ background: rgba(0, 255, 0, 0.1); border: 1px solid #00ff00; margin: 20px 0; padding: 20px; border-radius: 5px; }}
-                    .button {{ background: #00ff00; color: #000; padding: 10px 20px; border: none; cursor: pointer; margin: 5px; border-radius: 3px; }}
-                    .button:hover {{ background: #00cc00; }}
-                    .status {{ margin: 10px 0; padding: 10px; background: rgba(0, 255, 0, 0.2); border-radius: 3px; }}
-                    .data-display {{ background: #001100; padding: 15px; border-radius: 5px; white-space: pre-wrap; max-height: 300px; overflow-y: auto; }}
-                </style>
-            </head>
-            <body>
-                <div class="container">
-                    <div class="header">
-                        <h1>🛡️ QUANTUM SECURITY BACKUP SYSTEM 🛡️</h1>
-                        <p>© 2025 Ervin Remus Radosavlevici - Official Owner</p>
-                        <p>📧 Contact: radosavlevici210@icloud.com</p>
-                    </div>
-                    
-                    <div class="section">
-                        <h2>🔄 Backup Operations</h2>
-                        <button class="button" onclick="manualBackup()">Manual Backup</button>
-                        <button class="button" onclick="viewData()">View Data</button>
-                        <button class="button" onclick="viewSettings()">View Settings</button>
-                        <div id="backup-status" class="status"></div>
-                    </div>
-                    
-                    <div class="section">
-                        <h2>🔧 Restore Operations</h2>
-                        <button class="button" onclick="restoreData()">Restore Data</button>
-                        <button class="button" onclick="restoreDefaults()">Restore All to Defaults</button>
-                        <div id="restore-status" class="status"></div>
-                    </div>
-                    
-                    <div class="section">
-                        <h2>📊 Data Management</h2>
-                        <input type="text" id="data-key" placeholder="Enter key" style="padding: 10px; margin: 5px;">
-                        <input type="text" id="data-value" placeholder="Enter value" style="padding: 10px; margin: 5px;">
-                        <button class="button" onclick="saveData()">Save Data</button>
-                        <div id="data-status" class="status"></div>
-                    </div>
-                    
-                    <div class="section">
-                        <h2>📋 System Information</h2>
-                        <div id="system-info" class="data-display">Loading system information...</div>
-                    </div>
-                </div>
-                
-                <script>
-                    async function manualBackup() {{
-                        try {{
-                            const response = await fetch('/api/backup/manual', {{ method: 'POST' }});
-                            const result = await response.json();
-                            document.getElementById('backup-status').textContent = JSON.stringify(result, null, 2);
-                        }} catch (error) {{
-                            document.getElementById('backup-status').textContent = 'Error: ' + error.message;
-                        }}
-                    }}
-                    
-                    async function viewData() {{
-                        try {{
-                            const response = await fetch('/api/backup/data');
-                            const result = await response.json();
-                            document.getElementById('backup-status').textContent = JSON.stringify(result, null, 2);
-                        }} catch (error) {{
-                            document.getElementById('backup-status').textContent = 'Error: ' + error.message;
-                        }}
-                    }}
-                    
-                    async function viewSettings() {{
-                        try {{
-                            const response = await fetch('/api/backup/settings');
-                            const result = await response.json();
-                            document.getElementById('backup-status').textContent = JSON.stringify(result, null, 2);
-                        }} catch (error) {{
-                            document.getElementById('backup-status').textContent = 'Error: ' + error.message;
-                        }}
-                    }}
-                    
-                    async function restoreData() {{
-                        try {{
-                            const response = await fetch('/api/restore/data', {{ method: 'POST' }});
-                            const result = await response.json();
-                            document.getElementById('restore-status').textContent = JSON.stringify(result, null, 2);
-                        }} catch (error) {{
-                            document.getElementById('restore-status').textContent = 'Error: ' + error.message;
-                        }}
-                    }}
-                    
-                    async function restoreDefaults() {{
-                        if (confirm('This will restore all settings to defaults. Continue?')) {{
-                            try {{
-                                const response = await fetch('/api/restore/defaults', {{ method: 'POST' }});
-                                const result = await response.json();
-                                document.getElementById('restore-status').textContent = JSON.stringify(result, null, 2);
-                            }} catch (error) {{
-                                document.getElementById('restore-status').textContent = 'Error: ' + error.message;
-                            }}
-                        }}
-                    }}
-                    
-                    async function saveData() {{
-                        const key = document.getElementById('data-key').value;
-                        const value = document.getElementById('data-value').value;
-                        
-                        if (!key || !value) {{
-                            document.getElementById('data-status').textContent = 'Please enter both key and value';
-                            return;
-                        }}
-                        
-                        try {{
-                            const response = await fetch('/api/backup/data', {{
-                                method: 'POST',
-                                headers: {{ 'Content-Type': 'application/json' }},
-                                body: JSON.stringify({{ key, value }})
-                            }});
-                            const result = await response.json();
-                            document.getElementById('data-status').textContent = JSON.stringify(result, null, 2);
-                            document.getElementById('data-key').value = '';
-                            document.getElementById('data-value').value = '';
-                        }} catch (error) {{
-                            document.getElementById('data-status').textContent = 'Error: ' + error.message;
-                        }}
-                    }}
-                    
-                    // Load system information on page load
-                    window.onload = async function() {{
-                        try {{
-                            const response = await fetch('/api/system-status');
-                            const result = await response.json();
-                            document.getElementById('system-info').textContent = JSON.stringify(result, null, 2);
-                        }} catch (error) {{
-                            document.getElementById('system-info').textContent = 'Error loading system info: ' + error.message;
-                        }}
-                    }};
-                </script>
-            </body>
-            </html>
-            """
-        except Exception as e:
-            logger.error(f"Backup dashboard error: {e}")
-            return jsonify({'error': str(e)}), 500
+        return Response(_DASHBOARD_HTML, mimetype='text/html')
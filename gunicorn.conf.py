@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+International Compliance Frameworks - Production Server Configuration
+Copyright © 2025 Ervin Remus Radosavlevici
+Official Owner: Ervin Remus Radosavlevici
+Contact: radosavlevici210@icloud.com
+All rights reserved.
+
+Run with: gunicorn main:app
+"""
+
+import os
+
+bind = os.environ.get('BIND', '0.0.0.0:5000')
+
+# One threaded worker per core; each worker serves several requests at once
+workers = int(os.environ.get('WEB_CONCURRENCY', os.cpu_count() or 1))
+worker_class = 'gthread'
+threads = int(os.environ.get('WORKER_THREADS', 8))
+
+# Import the app once in the master so schema creation and seeding run a
+# single time instead of racing in every worker
+preload_app = True
+
+# Workers share the listening port via SO_REUSEPORT
+reuse_port = True
+
+# Keep worker heartbeat files off disk
+worker_tmp_dir = '/dev/shm'
+
+keepalive = 5
+
+def post_fork(server, worker):
+    """Drop database connections inherited from the preloading master"""
+    from main import app, db
+    with app.app_context():
+        db.engine.dispose(close=False)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Quantum Security System - orjson Flask JSON Provider
+Copyright © 2025 Ervin Remus Radosavlevici
+Official Owner: Ervin Remus Radosavlevici
+Contact: radosavlevici210@icloud.com
+All rights reserved.
+"""
+
+from flask.json.provider import JSONProvider
+import json
+import math
+import re
+import orjson
+
+# orjson reads integers outside the 64-bit range as floats, so bodies with
+# long digit runs are re-read with the stdlib before they are validated
+_LONG_DIGITS = re.compile(rb'\d{19}')
+
+# Integer range orjson can write
+_INT_MIN = -(2 ** 63)
+_INT_MAX = 2 ** 64 - 1
+
+def check_json_value(obj):
+    """Raise ValueError for NaN, Infinity and integers orjson cannot write exactly"""
+    if isinstance(obj, float):
+        if not math.isfinite(obj):
+            raise ValueError("NaN and Infinity are not supported")
+    elif isinstance(obj, int) and not isinstance(obj, bool):
+        if not _INT_MIN <= obj <= _INT_MAX:
+            raise ValueError("Integers beyond 64 bits are not supported")
+    elif isinstance(obj, dict):
+        for value in obj.values():
+            check_json_value(value)
+    elif isinstance(obj, (list, tuple)):
+        for item in obj:
+            check_json_value(item)
+
+def reparse_exact(raw, parsed):
+    """Return parsed, or raw re-read by the stdlib if it may hold integers beyond 64 bits"""
+    if _LONG_DIGITS.search(raw):
+        return json.loads(raw)
+    return parsed
+
+def loads_json(data):
+    """Parse a JSON document, falling back to stdlib json for input orjson rejects"""
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        # NaN or lone surrogates in files written by the stdlib encoder
+        return json.loads(data)
+
+def dumps_json(obj, indent=False):
+    """Serialize obj to JSON bytes, falling back to stdlib json for values orjson refuses"""
+    option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+    try:
+        return orjson.dumps(obj, option=option)
+    except TypeError:
+        # Lone surrogates and other values orjson cannot encode
+        return json.dumps(obj, indent=2 if indent else None).encode('utf-8')
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson for jsonify and request parsing"""
+    
+    def dumps(self, obj, **kwargs):
+        """Serialize obj to a JSON string"""
+        return dumps_json(obj).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        """Deserialize a JSON str or bytes document"""
+        return orjson.loads(s)
@@ -1,6 +1,8 @@
-from flask import Flask, jsonify, render_template_string
+from flask import Flask, jsonify
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import func, select
 from sqlalchemy.orm import DeclarativeBase
+from json_provider import OrjsonProvider
 import os
 from datetime import datetime
 
@@ -8,9 +10,15 @@ class Base(DeclarativeBase):
     pass
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 app.secret_key = os.environ.get('SESSION_SECRET', 'compliance-key')
 app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///compliance.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# SQLite engines may use pools that take no size (e.g. StaticPool for :memory:)
+if not app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', (os.cpu_count() or 1) * 2))
+    }
 
 db = SQLAlchemy(app, model_class=Base)
 
@@ -21,37 +29,46 @@ class ComplianceRecord(db.Model):
     owner = db.Column(db.String(100), default='Ervin Remus Radosavlevici')
     timestamp = db.Column(db.DateTime, default=db.func.current_timestamp())
 
+# Precompiled Core statements, executed without building ORM Query objects
+_COUNT_STMT = select(func.count(ComplianceRecord.id))
+_FRAMEWORKS_STMT = select(ComplianceRecord.framework, ComplianceRecord.status).order_by(ComplianceRecord.id)
+
 with app.app_context():
     db.create_all()
-    if not ComplianceRecord.query.first():
+    if not db.session.execute(_COUNT_STMT).scalar():
         frameworks = ['WIPO', 'ISO27001', 'GDPR', 'SOC2', 'NIST']
         for fw in frameworks:
             record = ComplianceRecord(framework=fw)
             db.session.add(record)
         db.session.commit()
+    # Records are seeded once and never written afterwards
+    _CACHED_FRAMEWORKS = [tuple(row) for row in db.session.execute(_FRAMEWORKS_STMT)]
+    _CACHED_COUNT = len(_CACHED_FRAMEWORKS)
+
+_INDEX_HTML = '''
+<h1>International Compliance Frameworks</h1>
+<h2>© 2025 Ervin Remus Radosavlevici</h2>
+<p>Contact: radosavlevici210@icloud.com</p>
+<h3>Active Frameworks:</h3>
+{% for framework, status in records %}
+<p>{{ framework }}: {{ status }}</p>
+{% endfor %}
+'''
+_INDEX_TMPL = app.jinja_env.from_string(_INDEX_HTML)
 
 @app.route('/')
 def index():
-    records = ComplianceRecord.query.all()
-    html = '''
-    <h1>International Compliance Frameworks</h1>
-    <h2>© 2025 Ervin Remus Radosavlevici</h2>
-    <p>Contact: radosavlevici210@icloud.com</p>
-    <h3>Active Frameworks:</h3>
-    {% for record in records %}
-    <p>{{ record.framework }}: {{ record.status }}</p>
-    {% endfor %}
-    '''
-    return render_template_string(html, records=records)
+    return _INDEX_TMPL.render(records=_CACHED_FRAMEWORKS)
 
 @app.route('/api/compliance')
 def compliance_api():
     return jsonify({
         'owner': 'Ervin Remus Radosavlevici',
         'contact': 'radosavlevici210@icloud.com',
-        'frameworks_active': ComplianceRecord.query.count(),
+        'frameworks_active': _CACHED_COUNT,
         'status': 'PRODUCTION_READY'
     })
 
 if __name__ == '__main__':
+    # Development server only; production runs under gunicorn (see gunicorn.conf.py)
     app.run(host='0.0.0.0', port=5000)